@@ -5,7 +5,7 @@ Safely delete nucleotideAlignment and siloReads files from S3 by file ID.
 This script reads a JSON file (produced by fetch_file_ids.py) and deletes the
 corresponding files from an S3-compatible bucket.
 
-Usage: python delete_by_file_ids.py <file_ids_json> <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--dry-run] [--type TYPE]
+Usage: python delete_by_file_ids.py <file_ids_json> <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--dry-run] [--type TYPE] [--verbose]
 
 Arguments:
     file_ids_json: Path to JSON file with file IDs (from fetch_file_ids.py)
@@ -19,24 +19,36 @@ Arguments:
 Options:
     --dry-run: Preview deletions without actually deleting
     --type TYPE: Only delete files of specified type (nucleotideAlignment or siloReads)
+    --verbose: Log every key as it is deleted
 
 Safety features:
     - Dry-run mode to preview what would be deleted
     - Confirmation prompt before actual deletion
-    - Detailed logging of each operation
+    - Per-batch progress, with per-file logging under --verbose
     - Summary report at the end
 """
 
-import boto3
+import itertools
 import json
 import sys
 
+from s3_delete import (
+    FILE_TYPES,
+    DeleteInterrupted,
+    collect_files_to_delete,
+    configure_logging,
+    create_s3_client,
+    delete_files,
+    unique_files,
+)
+
 
 def parse_args(argv):
     """Parse command-line arguments."""
     args = {
         "dry_run": False,
         "file_type": None,  # None means both types
+        "verbose": False,
     }
 
     # Filter out options
@@ -45,6 +57,8 @@ def parse_args(argv):
     while i < len(argv):
         if argv[i] == "--dry-run":
             args["dry_run"] = True
+        elif argv[i] == "--verbose":
+            args["verbose"] = True
         elif argv[i] == "--type":
             if i + 1 < len(argv):
                 args["file_type"] = argv[i + 1]
@@ -65,39 +79,25 @@ def load_file_ids(json_path: str) -> dict:
         return json.load(f)
 
 
-def collect_files_to_delete(file_ids: dict, prefix: str, file_type: str | None) -> list[tuple[str, str, str]]:
-    """
-    Collect list of files to delete.
-
-    Returns: List of (submission_id, file_type, s3_key) tuples
+def count_files_to_delete(file_ids: dict, file_type: str | None) -> int:
+    """Count unique files to delete, without building keys.
 
-    Note: file_ids values contain lists of file IDs (not single values)
+    All keys share the same prefix, so unique file IDs means unique keys.
     """
-    files = []
-
-    for submission_id, ids in file_ids.items():
-        if file_type is None or file_type == "nucleotideAlignment":
-            for file_id in ids.get("nucleotideAlignment", []):
-                s3_key = f"{prefix}{file_id}" if prefix else file_id
-                files.append((submission_id, "nucleotideAlignment", s3_key))
-
-        if file_type is None or file_type == "siloReads":
-            for file_id in ids.get("siloReads", []):
-                s3_key = f"{prefix}{file_id}" if prefix else file_id
-                files.append((submission_id, "siloReads", s3_key))
-
-    return files
+    types = (file_type,) if file_type else FILE_TYPES
+    return len({file_id for ids in file_ids.values() for t in types for file_id in ids.get(t) or ()})
 
 
 def main():
     positional, options = parse_args(sys.argv[1:])
 
     if len(positional) < 7:
-        print("Usage: python delete_by_file_ids.py <file_ids_json> <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--dry-run] [--type TYPE]")
+        print("Usage: python delete_by_file_ids.py <file_ids_json> <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--dry-run] [--type TYPE] [--verbose]")
         print("")
         print("Options:")
         print("  --dry-run          Preview deletions without actually deleting")
         print("  --type TYPE        Only delete 'nucleotideAlignment' or 'siloReads'")
+        print("  --verbose          Log every key as it is deleted")
         sys.exit(1)
 
     file_ids_json = positional[0]
@@ -108,15 +108,13 @@ def main():
     endpoint = positional[5]
     region = positional[6]
 
-    # Ensure endpoint has https:// prefix
-    if not endpoint.startswith("http://") and not endpoint.startswith("https://"):
-        endpoint = f"https://{endpoint}"
-
     dry_run = options["dry_run"]
     file_type = options["file_type"]
 
+    configure_logging(options["verbose"])
+
     # Validate file_type if specified
-    if file_type and file_type not in ("nucleotideAlignment", "siloReads"):
+    if file_type and file_type not in FILE_TYPES:
         print(f"Error: --type must be 'nucleotideAlignment' or 'siloReads', got '{file_type}'")
         sys.exit(1)
 
@@ -125,56 +123,46 @@ def main():
     file_ids = load_file_ids(file_ids_json)
     print(f"Loaded {len(file_ids)} submissions")
 
-    # Collect files to delete
-    files_to_delete = collect_files_to_delete(file_ids, prefix, file_type)
-    print(f"Found {len(files_to_delete)} files to delete")
+    # Count files to delete (cheap pass; keys are built lazily later)
+    total_files = count_files_to_delete(file_ids, file_type)
+    print(f"Found {total_files} files to delete")
 
-    if not files_to_delete:
+    if not total_files:
         print("No files to delete.")
         return
 
     # Show preview
     print("\nFiles to delete:")
     print("-" * 80)
-    for submission_id, ftype, s3_key in files_to_delete[:10]:
+    for submission_id, ftype, s3_key in itertools.islice(unique_files(collect_files_to_delete(file_ids, prefix, file_type)), 10):
         print(f"  [{ftype}] {s3_key} (submission: {submission_id})")
-    if len(files_to_delete) > 10:
-        print(f"  ... and {len(files_to_delete) - 10} more files")
+    if total_files > 10:
+        print(f"  ... and {total_files - 10} more files")
     print("-" * 80)
 
     if dry_run:
         print("\n[DRY RUN] No files were deleted.")
-        print(f"Would delete {len(files_to_delete)} files from s3://{bucket_name}/")
+        print(f"Would delete {total_files} files from s3://{bucket_name}/")
         return
 
     # Confirmation prompt
-    print(f"\nWARNING: This will permanently delete {len(files_to_delete)} files from s3://{bucket_name}/")
+    print(f"\nWARNING: This will permanently delete {total_files} files from s3://{bucket_name}/")
     confirmation = input("Type 'DELETE' to confirm: ")
     if confirmation != "DELETE":
         print("Aborted.")
         sys.exit(0)
 
     # Initialize S3 client
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret_key,
-        endpoint_url=endpoint,
-        region_name=region
-    )
+    s3 = create_s3_client(access_key, secret_key, endpoint, region)
 
     # Delete files
-    deleted_count = 0
-    error_count = 0
-
-    for submission_id, ftype, s3_key in files_to_delete:
-        try:
-            s3.delete_object(Bucket=bucket_name, Key=s3_key)
-            print(f"Deleted: {s3_key}")
-            deleted_count += 1
-        except Exception as e:
-            print(f"Error deleting {s3_key}: {e}")
-            error_count += 1
+    failure = None
+    try:
+        deleted_count, error_count = delete_files(
+            s3, bucket_name, unique_files(collect_files_to_delete(file_ids, prefix, file_type))
+        )
+    except DeleteInterrupted as e:
+        deleted_count, error_count, failure = e.deleted_count, e.error_count, e
 
     # Summary
     print("\n" + "=" * 80)
@@ -182,7 +170,10 @@ def main():
     print("=" * 80)
     print(f"Successfully deleted: {deleted_count}")
     print(f"Errors: {error_count}")
-    print(f"Total processed: {len(files_to_delete)}")
+    print(f"Total processed: {deleted_count + error_count}")
+    if failure:
+        print(f"Stopped early: {failure}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
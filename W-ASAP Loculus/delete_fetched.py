@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Fetch nucleotideAlignment and siloReads file IDs from the WASAP API and delete
+the corresponding files from S3 in one pass.
+
+This fuses fetch_file_ids.py and delete_by_file_ids.py: submissions are streamed
+from the API straight into batched deletes, without an intermediate JSON file.
+Use the two-script workflow when the list of file IDs should be kept for audit.
+
+Usage: python delete_fetched.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--api-url URL] [--dry-run] [--type TYPE] [--verbose]
+
+Arguments:
+    bucket_name: S3 bucket name
+    prefix: Prefix path in bucket (e.g., 'data/' or '')
+    access_key: S3 access key
+    secret_key: S3 secret key
+    endpoint: S3 endpoint URL
+    region: S3 region
+
+Options:
+    --api-url URL: API URL (default: https://api.db.wasap.genspectrum.org/backend/rsva/get-released-data)
+    --dry-run: Preview deletions without actually deleting
+    --type TYPE: Only delete files of specified type (nucleotideAlignment or siloReads)
+    --verbose: Log every key as it is deleted
+
+Safety features:
+    - Dry-run mode to preview what would be deleted
+    - Preview and file count before the confirmation prompt
+    - Confirmation prompt before actual deletion
+    - Summary report at the end
+
+The feed is streamed twice: once for the preview and count, and again for
+deletion, so files released in between are deleted as well.
+"""
+
+import itertools
+import sys
+
+from fetch_file_ids import DEFAULT_API_URL, extract_file_ids_stream, fetch_released_data
+from s3_delete import (
+    FILE_TYPES,
+    DeleteInterrupted,
+    configure_logging,
+    create_s3_client,
+    delete_files,
+    iter_files_to_delete,
+    unique_files,
+)
+
+
+def parse_args(argv):
+    """Parse command-line arguments."""
+    args = {
+        "api_url": DEFAULT_API_URL,
+        "dry_run": False,
+        "file_type": None,  # None means both types
+        "verbose": False,
+    }
+
+    # Filter out options
+    positional = []
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--dry-run":
+            args["dry_run"] = True
+        elif argv[i] == "--verbose":
+            args["verbose"] = True
+        elif argv[i] == "--type":
+            if i + 1 < len(argv):
+                args["file_type"] = argv[i + 1]
+                i += 1
+            else:
+                print("Error: --type requires a value (nucleotideAlignment or siloReads)")
+                sys.exit(1)
+        elif argv[i] == "--api-url":
+            if i + 1 < len(argv):
+                args["api_url"] = argv[i + 1]
+                i += 1
+            else:
+                print("Error: --api-url requires a value")
+                sys.exit(1)
+        else:
+            positional.append(argv[i])
+        i += 1
+
+    return positional, args
+
+
+def preview(api_url: str, prefix: str, file_type: str | None) -> int:
+    """
+    Stream the API and print what would be deleted.
+
+    Returns: Number of unique files that would be deleted
+    """
+    submissions = extract_file_ids_stream(fetch_released_data(api_url))
+    files = unique_files(iter_files_to_delete(submissions, prefix, file_type))
+
+    print("\nFiles to delete:")
+    print("-" * 80)
+    shown = 0
+    for submission_id, ftype, s3_key in itertools.islice(files, 10):
+        print(f"  [{ftype}] {s3_key} (submission: {submission_id})")
+        shown += 1
+    remaining = sum(1 for _ in files)
+    if remaining:
+        print(f"  ... and {remaining} more files")
+    print("-" * 80)
+
+    return shown + remaining
+
+
+def main():
+    positional, options = parse_args(sys.argv[1:])
+
+    if len(positional) < 6:
+        print("Usage: python delete_fetched.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--api-url URL] [--dry-run] [--type TYPE] [--verbose]")
+        print("")
+        print("Options:")
+        print("  --api-url URL      API to fetch released data from")
+        print("  --dry-run          Preview deletions without actually deleting")
+        print("  --type TYPE        Only delete 'nucleotideAlignment' or 'siloReads'")
+        print("  --verbose          Log every key as it is deleted")
+        sys.exit(1)
+
+    bucket_name = positional[0]
+    prefix = positional[1]
+    access_key = positional[2]
+    secret_key = positional[3]
+    endpoint = positional[4]
+    region = positional[5]
+
+    api_url = options["api_url"]
+    file_type = options["file_type"]
+
+    configure_logging(options["verbose"])
+
+    # Validate file_type if specified
+    if file_type and file_type not in FILE_TYPES:
+        print(f"Error: --type must be 'nucleotideAlignment' or 'siloReads', got '{file_type}'")
+        sys.exit(1)
+
+    # Stream the feed once to show what would be deleted
+    print(f"Fetching data from: {api_url}")
+    total_files = preview(api_url, prefix, file_type)
+    print(f"Found {total_files} files to delete")
+
+    if not total_files:
+        print("No files to delete.")
+        return
+
+    if options["dry_run"]:
+        print("\n[DRY RUN] No files were deleted.")
+        print(f"Would delete {total_files} files from s3://{bucket_name}/")
+        return
+
+    # Confirmation prompt
+    print(f"\nWARNING: This will permanently delete {total_files} files from s3://{bucket_name}/")
+    confirmation = input("Type 'DELETE' to confirm: ")
+    if confirmation != "DELETE":
+        print("Aborted.")
+        sys.exit(0)
+
+    s3 = create_s3_client(access_key, secret_key, endpoint, region)
+
+    # Delete files as submissions arrive
+    submissions = extract_file_ids_stream(fetch_released_data(api_url))
+    failure = None
+    try:
+        deleted_count, error_count = delete_files(
+            s3, bucket_name, unique_files(iter_files_to_delete(submissions, prefix, file_type))
+        )
+    except DeleteInterrupted as e:
+        # e.g. the API stream broke after some batches were already deleted
+        deleted_count, error_count, failure = e.deleted_count, e.error_count, e
+
+    # Summary
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Successfully deleted: {deleted_count}")
+    print(f"Errors: {error_count}")
+    print(f"Total processed: {deleted_count + error_count}")
+    if failure:
+        print(f"Stopped early: {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,15 @@
 """
 Fetch nucleotideAlignment and siloReads file IDs for each submissionId from the WASAP API.
 
-Usage: python fetch_file_ids.py <output_file> [api_url]
+Usage: python fetch_file_ids.py <output_file> [api_url] [--pretty]
 
 Arguments:
     output_file: Path to write the JSON output (e.g., file_ids.json)
     api_url: Optional API URL (default: https://api.db.wasap.genspectrum.org/backend/rsva/get-released-data)
 
+Options:
+    --pretty: Indent the JSON output for reading (default: compact)
+
 Output format (JSON):
     {
         "submissionId1": {
@@ -18,28 +21,81 @@ Output format (JSON):
     }
 """
 
+import importlib.util
 import json
 import sys
 import urllib.request
+from collections.abc import Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    import json as orjson
 
 DEFAULT_API_URL = "https://api.db.wasap.genspectrum.org/backend/rsva/get-released-data"
 
+# Read buffer for the NDJSON stream; small reads make line parsing much slower
+READ_BUFFER_SIZE = 65536
+
+NDJSON_HEADERS = {"Accept": "application/x-ndjson"}
+
 
-def fetch_released_data(api_url: str) -> list[dict]:
-    """Fetch released data from the API (NDJSON format)."""
-    request = urllib.request.Request(
-        api_url,
-        headers={"Accept": "application/x-ndjson"}
-    )
+def iter_chunks_httpx(httpx, api_url: str) -> Iterator[bytes]:
+    """Stream the response body over a pooled httpx client (HTTP/2 if h2 is installed)."""
+    http2 = importlib.util.find_spec("h2") is not None
+    timeout = httpx.Timeout(30.0, read=None)
+    # Follow redirects like urllib does; httpx does not by default
+    with httpx.Client(http2=http2, timeout=timeout, follow_redirects=True) as client:
+        with client.stream("GET", api_url, headers=NDJSON_HEADERS) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes(READ_BUFFER_SIZE)
 
-    records = []
+
+def iter_chunks_urllib(api_url: str) -> Iterator[bytes]:
+    """Stream the response body with urllib from the standard library."""
+    request = urllib.request.Request(api_url, headers=NDJSON_HEADERS)
     with urllib.request.urlopen(request) as response:
-        for line in response:
-            line = line.decode('utf-8').strip()
-            if line:
-                records.append(json.loads(line))
+        read = response.read
+        while chunk := read(READ_BUFFER_SIZE):
+            yield chunk
+
+
+def split_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split a stream of byte chunks into non-empty lines.
 
-    return records
+    Deleting from the front of a bytearray is cheap in CPython, so total
+    work stays linear in the size of the stream.
+    """
+    buf = bytearray()
+    for chunk in chunks:
+        buf.extend(chunk)
+        while (nl := buf.find(b"\n")) >= 0:
+            line = bytes(buf[:nl])
+            del buf[:nl + 1]
+            if line.strip():
+                yield line
+    if buf.strip():
+        yield bytes(buf)
+
+
+def fetch_released_data(api_url: str) -> Iterator[dict]:
+    """Stream released data from the API (NDJSON format), one record at a time.
+
+    Uses httpx when it is installed and falls back to urllib otherwise.
+    """
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+
+    if httpx is not None and api_url.startswith(("http://", "https://")):
+        chunks = iter_chunks_httpx(httpx, api_url)
+    else:
+        chunks = iter_chunks_urllib(api_url)
+
+    # The parser decodes UTF-8 and ignores surrounding whitespace itself
+    for line in split_lines(chunks):
+        yield orjson.loads(line)
 
 
 def parse_file_field(field_value: str | None) -> list[dict]:
@@ -47,52 +103,70 @@ def parse_file_field(field_value: str | None) -> list[dict]:
     if not field_value:
         return []
     try:
-        return json.loads(field_value)
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(field_value)
+    except (orjson.JSONDecodeError, TypeError):
         return []
 
 
-def extract_file_ids(records: list[dict]) -> dict:
-    """Extract nucleotideAlignment and siloReads file IDs per submissionId.
+def extract_file_id_list(field_value: str | None) -> list[str]:
+    """Parse a file info field and return the non-empty fileIds in it."""
+    return [file_id for f in parse_file_field(field_value) if (file_id := f.get("fileId"))]
+
+
+def extract_file_ids_stream(records: Iterable[dict]) -> Iterator[tuple[str, dict]]:
+    """Yield (submissionId, file IDs) pairs as records arrive.
 
     The API returns data nested in 'metadata', and file fields are JSON strings
     containing arrays of {fileId, name, url} objects.
     """
-    result = {}
-
     for record in records:
         # Data is nested inside 'metadata'
         metadata = record.get("metadata", {})
-        submission_id = metadata.get("submissionId")
-        if not submission_id:
+        if not (submission_id := metadata.get("submissionId")):
             continue
 
-        # Parse the JSON string fields to extract fileIds
-        alignment_files = parse_file_field(metadata.get("nucleotideAlignment"))
-        silo_files = parse_file_field(metadata.get("siloReads"))
-
-        result[submission_id] = {
-            "nucleotideAlignment": [f.get("fileId") for f in alignment_files if f.get("fileId")],
-            "siloReads": [f.get("fileId") for f in silo_files if f.get("fileId")]
+        yield submission_id, {
+            "nucleotideAlignment": extract_file_id_list(metadata.get("nucleotideAlignment")),
+            "siloReads": extract_file_id_list(metadata.get("siloReads"))
         }
 
-    return result
+
+def extract_file_ids(records: Iterable[dict]) -> dict:
+    """Extract nucleotideAlignment and siloReads file IDs per submissionId.
+
+    Records are consumed one at a time, so `records` may be a stream.
+    """
+    return dict(extract_file_ids_stream(records))
+
+
+def write_file_ids(file_ids: dict, output_file: str, pretty: bool = False):
+    """Write file IDs as JSON; compact by default, indented with pretty=True."""
+    if pretty:
+        with open(output_file, 'w') as f:
+            json.dump(file_ids, f, indent=2)
+        return
+
+    data = orjson.dumps(file_ids)
+    if isinstance(data, str):  # stdlib json fallback returns str
+        data = data.encode("utf-8")
+    with open(output_file, 'wb') as f:
+        f.write(data)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python fetch_file_ids.py <output_file> [api_url]")
+    pretty = "--pretty" in sys.argv
+    argv = [arg for arg in sys.argv if arg != "--pretty"]
+
+    if len(argv) < 2:
+        print("Usage: python fetch_file_ids.py <output_file> [api_url] [--pretty]")
         print("Example: python fetch_file_ids.py file_ids.json")
         sys.exit(1)
 
-    output_file = sys.argv[1]
-    api_url = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_API_URL
+    output_file = argv[1]
+    api_url = argv[2] if len(argv) > 2 else DEFAULT_API_URL
 
     print(f"Fetching data from: {api_url}")
-    records = fetch_released_data(api_url)
-    print(f"Fetched {len(records)} records")
-
-    file_ids = extract_file_ids(records)
+    file_ids = extract_file_ids(fetch_released_data(api_url))
     print(f"Extracted file IDs for {len(file_ids)} submissions")
 
     # Count file IDs (now lists)
@@ -101,9 +175,7 @@ def main():
     print(f"  - nucleotideAlignment: {alignment_count} files")
     print(f"  - siloReads: {silo_count} files")
 
-    with open(output_file, 'w') as f:
-        json.dump(file_ids, f, indent=2)
-
+    write_file_ids(file_ids, output_file, pretty)
     print(f"Written to: {output_file}")
 
 
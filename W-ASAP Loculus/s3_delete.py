@@ -0,0 +1,214 @@
+"""
+Shared helpers for deleting nucleotideAlignment and siloReads files from S3.
+
+Used by delete_by_file_ids.py (deletes from a saved JSON file) and
+delete_fetched.py (streams file IDs from the API straight into deletion).
+"""
+
+import boto3
+import logging
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+BATCH_SIZE = 1000
+# Number of DeleteObjects requests in flight at once
+MAX_WORKERS = 16
+
+FILE_TYPES = ("nucleotideAlignment", "siloReads")
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(verbose: bool):
+    """Log progress to stderr; per-file lines are only logged when verbose."""
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+
+def create_s3_client(access_key: str, secret_key: str, endpoint: str, region: str):
+    """Create an S3 client tuned for many concurrent DeleteObjects requests."""
+    # Ensure endpoint has https:// prefix
+    if not endpoint.startswith("http://") and not endpoint.startswith("https://"):
+        endpoint = f"https://{endpoint}"
+
+    return boto3.client(
+        's3',
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        endpoint_url=endpoint,
+        region_name=region,
+        config=Config(
+            max_pool_connections=64,
+            retries={"mode": "adaptive", "max_attempts": 10},
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=60
+        )
+    )
+
+
+def iter_files_to_delete(submissions: Iterable[tuple[str, dict]], prefix: str,
+                         file_type: str | None) -> Iterator[tuple[str, str, str]]:
+    """
+    Lazily collect files to delete from a stream of (submission_id, ids) pairs.
+
+    Yields: (submission_id, file_type, s3_key) tuples
+
+    Note: ids values contain lists of file IDs (not single values)
+    """
+    # Decide once, not per file
+    build_key = (lambda file_id: prefix + file_id) if prefix else (lambda file_id: file_id)
+    want_alignment = file_type is None or file_type == "nucleotideAlignment"
+    want_silo = file_type is None or file_type == "siloReads"
+
+    for submission_id, ids in submissions:
+        # `or ()` also covers null lists, without allocating a default list
+        if want_alignment and (alignment := ids.get("nucleotideAlignment") or ()):
+            for file_id in alignment:
+                yield submission_id, "nucleotideAlignment", build_key(file_id)
+
+        if want_silo and (silo := ids.get("siloReads") or ()):
+            for file_id in silo:
+                yield submission_id, "siloReads", build_key(file_id)
+
+
+def collect_files_to_delete(file_ids: dict, prefix: str, file_type: str | None) -> Iterator[tuple[str, str, str]]:
+    """Lazily collect files to delete from a loaded {submission_id: ids} dict."""
+    return iter_files_to_delete(file_ids.items(), prefix, file_type)
+
+
+def unique_files(files: Iterable[tuple[str, str, str]]) -> Iterator[tuple[str, str, str]]:
+    """Drop files whose S3 key was already seen, keeping the first occurrence."""
+    seen = set()
+    for file in files:
+        if file[2] not in seen:
+            seen.add(file[2])
+            yield file
+
+
+def delete_batch(s3, bucket_name: str, batch: list[tuple[str, str, str]]) -> tuple[int, int]:
+    """
+    Delete a batch of files with a single DeleteObjects request.
+
+    Returns: (deleted_count, error_count) for the batch
+    """
+    keys = [{"Key": s3_key} for _, _, s3_key in batch]
+    if logger.isEnabledFor(logging.DEBUG):
+        for submission_id, ftype, s3_key in batch:
+            logger.debug("Deleting: [%s] %s (submission: %s)", ftype, s3_key, submission_id)
+    try:
+        response = s3.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": keys, "Quiet": True}
+        )
+    except (ClientError, BotoCoreError) as e:
+        # Request-level failure (e.g. access denied, connection lost after retries)
+        logger.error("Error deleting batch of %d files: %s", len(keys), e)
+        return 0, len(keys)
+
+    # Quiet mode only reports failures; per-key errors never raise
+    errors = response.get("Errors", [])
+    for error in errors:
+        logger.error("Error deleting %s: %s %s", error.get("Key"), error.get("Code"), error.get("Message"))
+    logger.info("Deleted batch: %d/%d files", len(keys) - len(errors), len(keys))
+    return len(keys) - len(errors), len(errors)
+
+
+class DeleteInterrupted(Exception):
+    """Deletion stopped early; carries the counts reached before it stopped."""
+
+    def __init__(self, cause: BaseException, deleted_count: int, error_count: int):
+        super().__init__(str(cause) or type(cause).__name__)
+        self.deleted_count = deleted_count
+        self.error_count = error_count
+
+
+class DeleteBatcher:
+    """
+    Accumulate files and delete them in batches as soon as a batch is full.
+
+    Batches run on a thread pool with at most `max_workers` in flight. Keys
+    are sent as given; wrap the input in unique_files() to skip duplicates.
+    Use as a context manager so the last partial batch is sent and all
+    requests finish on exit; the totals are then in `deleted_count` and
+    `error_count`. If the block exits with an exception, the partial batch
+    is dropped instead.
+    """
+
+    def __init__(self, s3, bucket_name: str, batch_size: int = BATCH_SIZE, max_workers: int = MAX_WORKERS):
+        self.s3 = s3
+        self.bucket_name = bucket_name
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.deleted_count = 0
+        self.error_count = 0
+        self._batch = []
+        self._pending = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_file(self, file: tuple[str, str, str]):
+        """Queue one (submission_id, file_type, s3_key) tuple."""
+        self._batch.append(file)
+        if len(self._batch) >= self.batch_size:
+            self._submit()
+
+    def close(self):
+        """Send the last partial batch and wait for all requests to finish."""
+        if self._batch:
+            self._submit()
+        self._collect(self._pending)
+        self._pending = set()
+        self._executor.shutdown()
+
+    def abort(self):
+        """Drop the unsent batch, cancel queued requests and wait for running ones."""
+        self._batch = []
+        for future in self._pending:
+            future.cancel()
+        self._collect(future for future in self._pending if not future.cancelled())
+        self._pending = set()
+        self._executor.shutdown()
+
+    def _submit(self):
+        if len(self._pending) >= self.max_workers:
+            done, self._pending = wait(self._pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        self._pending.add(self._executor.submit(delete_batch, self.s3, self.bucket_name, self._batch))
+        self._batch = []
+
+    def _collect(self, futures):
+        for future in futures:
+            batch_deleted, batch_errors = future.result()
+            self.deleted_count += batch_deleted
+            self.error_count += batch_errors
+
+
+def delete_files(s3, bucket_name: str, files: Iterable[tuple[str, str, str]]) -> tuple[int, int]:
+    """
+    Delete files in batches on a thread pool, streaming from `files`.
+
+    Returns: (deleted_count, error_count)
+
+    Raises DeleteInterrupted if `files` fails or the run is interrupted,
+    after in-flight requests finish, so callers can still report progress.
+    """
+    batcher = DeleteBatcher(s3, bucket_name)
+    try:
+        with batcher:
+            for file in files:
+                batcher.add_file(file)
+    except (Exception, KeyboardInterrupt) as e:
+        raise DeleteInterrupted(e, batcher.deleted_count, batcher.error_count) from e
+    return batcher.deleted_count, batcher.error_count
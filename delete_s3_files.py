@@ -1,40 +1,166 @@
 #!/usr/bin/env python3
 """
 Script to delete all files in an S3-compatible bucket under a specified prefix.
-Usage: python delete_s3_files.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region>
+Usage: python delete_s3_files.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--verbose]
 """
 
 import boto3
+import logging
+import queue
 import sys
+import threading
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
-if len(sys.argv) < 7:
-    print("Usage: python delete_s3_files.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region>")
+# S3 DeleteObjects accepts at most 1000 keys per request
+BATCH_SIZE = 1000
+# Number of DeleteObjects requests in flight at once
+MAX_WORKERS = 16
+# Batches listed ahead of the deleters; bounds memory on huge buckets
+QUEUE_SIZE = 8
+
+logger = logging.getLogger(__name__)
+
+verbose = "--verbose" in sys.argv
+argv = [arg for arg in sys.argv if arg != "--verbose"]
+
+if len(argv) < 7:
+    print("Usage: python delete_s3_files.py <bucket_name> <prefix> <access_key> <secret_key> <endpoint> <region> [--verbose]")
     sys.exit(1)
 
-bucket_name = sys.argv[1]
-prefix = sys.argv[2]
-access_key = sys.argv[3]
-secret_key = sys.argv[4]
-endpoint = sys.argv[5]
-region = sys.argv[6]
+bucket_name = argv[1]
+prefix = argv[2]
+access_key = argv[3]
+secret_key = argv[4]
+endpoint = argv[5]
+region = argv[6]
+
+# Per-object lines are only logged with --verbose
+logging.basicConfig(format="%(message)s")
+logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 # Initialize S3 client with provided credentials and custom endpoint
 s3 = boto3.client('s3', 
                   aws_access_key_id=access_key, 
                   aws_secret_access_key=secret_key, 
                   endpoint_url=endpoint, 
-                  region_name=region)
+                  region_name=region,
+                  config=Config(max_pool_connections=64,
+                                retries={'mode': 'adaptive', 'max_attempts': 10},
+                                tcp_keepalive=True,
+                                connect_timeout=5,
+                                read_timeout=60))
 
 # Use paginator to handle large number of objects
 paginator = s3.get_paginator('list_objects_v2')
-pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+# One full page is exactly one DeleteObjects batch; owner info is never needed
+pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, FetchOwner=False,
+                           PaginationConfig={'PageSize': BATCH_SIZE})
 
 deleted_count = 0
-for page in pages:
-    if 'Contents' in page:
-        for obj in page['Contents']:
-            print(f"Deleting: {obj['Key']}")
-            s3.delete_object(Bucket=bucket_name, Key=obj['Key'])
-            deleted_count += 1
-
-print(f"Deleted {deleted_count} objects from {bucket_name}/{prefix}")
\ No newline at end of file
+error_count = 0
+count_lock = threading.Lock()
+# Unexpected listing/worker failures, reported after all threads finish
+failures = []
+# Set on Ctrl-C: stop listing and skip batches that have not started yet
+stop = threading.Event()
+
+
+def delete_batch(keys):
+    """Delete a batch of keys with a single DeleteObjects request."""
+    global deleted_count, error_count
+    if logger.isEnabledFor(logging.DEBUG):
+        for key in keys:
+            logger.debug("Deleting: %s", key['Key'])
+    try:
+        response = s3.delete_objects(Bucket=bucket_name, Delete={'Objects': keys, 'Quiet': True})
+    except (ClientError, BotoCoreError) as e:
+        # Keep the worker alive so the producer never blocks on a full queue
+        logger.error("Error deleting batch of %d objects: %s", len(keys), e)
+        with count_lock:
+            error_count += len(keys)
+        return
+    # Quiet mode only reports failures; per-key errors never raise
+    errors = response.get('Errors', [])
+    for error in errors:
+        logger.error("Error deleting %s: %s %s", error.get('Key'), error.get('Code'), error.get('Message'))
+    with count_lock:
+        deleted_count += len(keys) - len(errors)
+        error_count += len(errors)
+        logger.info("Deleted %d objects so far", deleted_count)
+
+
+def list_batches(batches):
+    """Producer: page through the prefix and enqueue batches of keys."""
+    try:
+        batch = []
+        for page in pages:
+            if stop.is_set():
+                return
+            if 'Contents' in page:
+                for obj in page['Contents']:
+                    batch.append({'Key': obj['Key']})
+                    if len(batch) == BATCH_SIZE:
+                        batches.put(batch)
+                        batch = []
+        if batch:
+            batches.put(batch)
+    except Exception as e:
+        # Stop here: the partially listed batch is not deleted
+        with count_lock:
+            failures.append(f"Listing {bucket_name}/{prefix} failed: {e}")
+    finally:
+        # One sentinel per worker so every deleter shuts down
+        for _ in range(MAX_WORKERS):
+            batches.put(None)
+
+
+def delete_worker(batches):
+    """Consumer: delete batches from the queue until a sentinel arrives."""
+    global error_count
+    while (batch := batches.get()) is not None:
+        # After a stop, keep draining (without deleting) until the sentinel
+        if stop.is_set():
+            continue
+        # Never let a worker die, or the producer could block on a full queue
+        try:
+            delete_batch(batch)
+        except Exception as e:
+            with count_lock:
+                error_count += len(batch)
+                failures.append(f"Deleting batch of {len(batch)} objects failed: {e}")
+
+
+batches = queue.Queue(maxsize=QUEUE_SIZE)
+# Daemon threads, so a second Ctrl-C while stopping exits immediately
+threads = [threading.Thread(target=list_batches, args=(batches,), daemon=True)]
+threads += [threading.Thread(target=delete_worker, args=(batches,), daemon=True) for _ in range(MAX_WORKERS)]
+for thread in threads:
+    thread.start()
+try:
+    for thread in threads:
+        thread.join()
+except KeyboardInterrupt:
+    stop.set()
+    # Drop queued batches so the producer is never blocked on a full queue,
+    # but keep any sentinels so every worker still shuts down
+    sentinels = 0
+    while True:
+        try:
+            sentinels += batches.get_nowait() is None
+        except queue.Empty:
+            break
+    for _ in range(sentinels):
+        batches.put(None)
+    logger.error("Interrupted: waiting for in-flight deletes to finish")
+    for thread in threads:
+        thread.join()
+    failures.append("Interrupted by user")
+
+print(f"Deleted {deleted_count} objects from {bucket_name}/{prefix}")
+if error_count:
+    print(f"Errors: {error_count}")
+for failure in failures:
+    logger.error("Error: %s", failure)
+if failures or error_count:
+    sys.exit(1)